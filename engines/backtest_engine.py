@@ -253,11 +253,51 @@ class BacktestEngine(BaseEngine):
         console.print()
         
         # === FULL LOGGING OF ALL METRICS ===
+        self.log_results(
+            symbol, strategy.__class__.__name__,
+            initial_value, final_value, pnl, return_pct, analyzers_results
+        )
+        
+        # Return results
+        return {
+            'initial_value': initial_value,
+            'final_value': final_value,
+            'pnl': pnl,
+            'return_pct': return_pct,
+            'analyzers': analyzers_results,
+            'strategy': results[0]
+        }
+    
+    def log_results(
+        self,
+        symbol: str,
+        strategy_name: str,
+        initial_value: float,
+        final_value: float,
+        pnl: float,
+        return_pct: float,
+        analyzers_results: Dict[str, Any]
+    ) -> None:
+        """
+        Write the complete metrics block to the log.
+        
+        The Analysis page parses these blocks, so every finished backtest
+        (including results served from a cache) should log one.
+        
+        Args:
+            symbol: Symbol that was backtested
+            strategy_name: Strategy class name
+            initial_value: Starting portfolio value
+            final_value: Ending portfolio value
+            pnl: Profit/loss
+            return_pct: Total return in percent
+            analyzers_results: Flattened analyzer metrics
+        """
         self.logger.info("=" * 60)
         self.logger.info("BACKTEST RESULTS - COMPLETE METRICS")
         self.logger.info("=" * 60)
         self.logger.info(f"Symbol: {symbol}")
-        self.logger.info(f"Strategy: {strategy.__class__.__name__}")
+        self.logger.info(f"Strategy: {strategy_name}")
         self.logger.info(f"Initial Capital: ${initial_value:,.2f}")
         self.logger.info(f"Final Value: ${final_value:,.2f}")
         self.logger.info(f"Total P&L: ${pnl:,.2f}")
@@ -296,13 +336,3 @@ class BacktestEngine(BaseEngine):
                 self.logger.info(f"Average Trade: ${avg_trade:,.2f}")
         
         self.logger.info("=" * 60)
-        
-        # Return results
-        return {
-            'initial_value': initial_value,
-            'final_value': final_value,
-            'pnl': pnl,
-            'return_pct': return_pct,
-            'analyzers': analyzers_results,
-            'strategy': results[0]
-        }
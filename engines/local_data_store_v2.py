@@ -62,6 +62,9 @@ class LocalDataStoreV2:
         
         # Initialize DuckDB connection
         self.conn = duckdb.connect(duckdb_path)
+        # Stored timestamps are UTC (naive or tz-aware); pin the session zone
+        # so naive values aren't reinterpreted in the machine's local zone
+        self.conn.execute("SET TimeZone = 'UTC'")
         self._init_schema()
     
     def __del__(self):
@@ -151,8 +154,8 @@ class LocalDataStoreV2:
         if not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
             df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s', utc=True)
         
-        # Add metadata
-        df = df.copy()
+        # Add metadata (duplicate bars within the batch: last one wins)
+        df = df.drop_duplicates(subset=['timestamp'], keep='last', ignore_index=True)
         df['source'] = source
         df['symbol'] = symbol
         df['timeframe'] = timeframe
@@ -172,9 +175,11 @@ class LocalDataStoreV2:
                 # Merge with existing data if file exists
                 if file_path.exists():
                     df_existing = pd.read_parquet(file_path)
-                    df_combined = pd.concat([df_existing, df_year], ignore_index=True)
-                    df_combined = df_combined.drop_duplicates(subset=['timestamp'], keep='last')
-                    df_combined = df_combined.sort_values('timestamp')
+                    df_combined = (
+                        pd.concat([df_existing, df_year], ignore_index=True)
+                        .drop_duplicates(subset=['timestamp'], keep='last', ignore_index=True)
+                        .sort_values('timestamp')
+                    )
                     df_combined.to_parquet(file_path, index=False)
                 else:
                     df_year.drop('year', axis=1).to_parquet(file_path, index=False)
@@ -190,9 +195,11 @@ class LocalDataStoreV2:
             # Merge with existing data if file exists
             if file_path.exists():
                 df_existing = pd.read_parquet(file_path)
-                df_combined = pd.concat([df_existing, df], ignore_index=True)
-                df_combined = df_combined.drop_duplicates(subset=['timestamp'], keep='last')
-                df_combined = df_combined.sort_values('timestamp')
+                df_combined = (
+                    pd.concat([df_existing, df], ignore_index=True)
+                    .drop_duplicates(subset=['timestamp'], keep='last', ignore_index=True)
+                    .sort_values('timestamp')
+                )
                 df_combined.to_parquet(file_path, index=False)
             else:
                 df.to_parquet(file_path, index=False)
@@ -266,28 +273,24 @@ class LocalDataStoreV2:
         if not result:
             return pd.DataFrame()
         
-        # Read all relevant files
-        dfs = []
-        for file_path, _, _ in result:
-            if Path(file_path).exists():
-                df = pd.read_parquet(file_path)
-                dfs.append(df)
+        paths = [file_path for file_path, _, _ in result if Path(file_path).exists()]
         
-        if not dfs:
+        if not paths:
             return pd.DataFrame()
         
-        # Combine and filter
-        df = pd.concat(dfs, ignore_index=True)
+        # Scan all relevant files at once; the date filter is pushed down
+        # into the Parquet reader so row groups outside the range are skipped
+        df = self.conn.execute("""
+            SELECT timestamp, open, high, low, close, volume
+            FROM read_parquet(?, union_by_name = true)
+            WHERE timestamp >= ? AND timestamp < ?
+            ORDER BY timestamp
+        """, [
+            paths,
+            pd.to_datetime(start, utc=True).to_pydatetime(),
+            pd.to_datetime(end, utc=True).to_pydatetime(),
+        ]).df()
         df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True)
-        
-        # Filter by date range
-        df = df[
-            (df['timestamp'] >= pd.to_datetime(start, utc=True)) &
-            (df['timestamp'] < pd.to_datetime(end, utc=True))
-        ]
-        
-        # Sort and set index
-        df = df.sort_values('timestamp')
         df = df.set_index('timestamp')
         
         # Return only OHLCV columns
@@ -308,17 +311,20 @@ class LocalDataStoreV2:
         This is because start date might be a weekend/holiday.
         """
         
+        # Existence probe: stop at the first overlapping catalog row
         query = """
-            SELECT COUNT(*) as count
+            SELECT 1
             FROM data_files
             WHERE source = ?
               AND symbol = ?
               AND timeframe = ?
-              AND NOT (max_date < ? OR min_date > ?)
+              AND min_date <= ?
+              AND max_date >= ?
+            LIMIT 1
         """
         
         result = self.conn.execute(query, [
-            source, symbol, timeframe, start, end
+            source, symbol, timeframe, end, start
         ]).fetchone()
         
-        return result[0] > 0 if result else False
+        return result is not None
@@ -2,139 +2,342 @@
 Analysis Page - View all backtest results
 """
 
+import json
+import mmap
+import re
+import sys
+import threading
+from collections import deque
+import duckdb
+import numpy as np
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
 import plotly.graph_objects as go
 from pathlib import Path
 
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_components.results_log import LOG_PATH, RESULTS_SCHEMA, load_all_backtest_results
+
 st.set_page_config(
     page_title="Analysis - WawaStock",
     page_icon="📊",
     layout="wide"
 )
 
-# Load results function
-def load_all_backtest_results():
-    """Load all backtest results from logs"""
-    results_list = []
+WEBGL_MIN_POINTS = 500
+RESULTS_DB_PATH = Path("data/analysis.duckdb")
+
+
+def summarize_results(results_list: list) -> dict:
+    """
+    Compute the Performance Overview aggregates in one pass over the results.
     
-    log_path = Path("logs/wawastock.log")
-    if not log_path.exists():
-        return []
+    Args:
+        results_list: Parsed result dicts
+        
+    Returns:
+        Dict with total_tests, avg_return, best_return, avg_sharpe and
+        avg_win_rate (None when no result has the underlying metric)
+    """
+    sums = {'return': 0.0, 'sharpe': 0.0, 'win_rate': 0.0}
+    counts = dict.fromkeys(sums, 0)
+    best_return = None
     
-    with open(log_path, 'r') as f:
-        content = f.read()
+    for r in results_list:
+        for key in sums:
+            value = r.get(key)
+            if value is not None:
+                sums[key] += value
+                counts[key] += 1
+        ret = r.get('return')
+        if ret is not None and (best_return is None or ret > best_return):
+            best_return = ret
     
-    blocks = content.split("BACKTEST RESULTS - COMPLETE METRICS")
+    def avg(key):
+        return sums[key] / counts[key] if counts[key] else None
     
-    for block in blocks[1:]:
-        result = {}
-        
-        lines = block.split('\n')
-        if lines and '|' in lines[0]:
-            try:
-                timestamp = lines[0].split('|')[0].strip()
-                if timestamp:
-                    result['timestamp'] = timestamp
-            except:
-                pass
-        
-        if "Symbol:" in block:
-            try:
-                result['symbol'] = block.split("Symbol:")[1].split('\n')[0].strip()
-            except:
-                pass
-        
-        if "Strategy:" in block:
-            try:
-                result['strategy'] = block.split("Strategy:")[1].split('\n')[0].strip()
-            except:
-                pass
-        
-        if "Initial Capital:" in block:
-            try:
-                val = block.split("Initial Capital:")[1].split('\n')[0].replace('$', '').replace(',', '').strip()
-                result['initial_value'] = float(val)
-            except:
-                pass
-        
-        if "Final Value:" in block:
-            try:
-                val = block.split("Final Value:")[1].split('\n')[0].replace('$', '').replace(',', '').strip()
-                result['final_value'] = float(val)
-            except:
-                pass
-        
-        if "Total P&L:" in block:
-            try:
-                val = block.split("Total P&L:")[1].split('\n')[0].replace('$', '').replace(',', '').strip()
-                result['pnl'] = float(val)
-            except:
-                pass
-        
-        if "Total Return:" in block:
-            try:
-                val = block.split("Total Return:")[1].split('\n')[0].replace('%', '').strip()
-                result['return'] = float(val)
-            except:
-                pass
-        
-        if "Sharpe Ratio:" in block:
-            try:
-                val = block.split("Sharpe Ratio:")[1].split('\n')[0].strip()
-                result['sharpe'] = float(val)
-            except:
-                pass
-        
-        if "Max Drawdown:" in block:
-            try:
-                val = block.split("Max Drawdown:")[1].split('\n')[0].replace('%', '').strip()
-                result['max_drawdown'] = float(val)
-            except:
-                pass
-        
-        if "Total Trades:" in block:
-            try:
-                val = block.split("Total Trades:")[1].split('\n')[0].strip()
-                result['total_trades'] = int(val)
-            except:
-                pass
-        
-        if "Won Trades:" in block:
-            try:
-                val = block.split("Won Trades:")[1].split('\n')[0].strip()
-                result['won_trades'] = int(val)
-            except:
-                pass
+    return {
+        'total_tests': len(results_list),
+        'avg_return': avg('return'),
+        'best_return': best_return,
+        'avg_sharpe': avg('sharpe'),
+        'avg_win_rate': avg('win_rate'),
+    }
+
+
+# Keyed on the log's (mtime, size), which changes on every write: keep only
+# the current version so old copies of the log don't pile up in memory
+@st.cache_data(show_spinner=False, max_entries=1)
+def _read_log_cached(log_mtime: float, log_size: int) -> str:
+    """Cached full log text for the download button, keyed on the log's mtime/size."""
+    return LOG_PATH.read_text()
+
+
+def tail_log_lines(log_path: Path, lines_to_show: int, filter_text: str = '') -> list:
+    """
+    Return the last log lines, optionally only those containing filter_text.
+    
+    The log is memory-mapped and scanned at byte level, so only the lines
+    that are returned get decoded and memory stays bounded by lines_to_show
+    rather than the log size.
+    
+    Args:
+        log_path: Path to the log file
+        lines_to_show: Maximum number of lines to return
+        filter_text: Case-insensitive substring to filter on
         
-        if "Lost Trades:" in block:
-            try:
-                val = block.split("Lost Trades:")[1].split('\n')[0].strip()
-                result['lost_trades'] = int(val)
-            except:
-                pass
+    Returns:
+        List of lines (with line endings), oldest first
+    """
+    if lines_to_show <= 0 or log_path.stat().st_size == 0:
+        return []
+    
+    with open(log_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = mm.size()
         
-        if "Win Rate:" in block:
-            try:
-                val = block.split("Win Rate:")[1].split('\n')[0].replace('%', '').strip()
-                result['win_rate'] = float(val)
-            except:
-                pass
+        if not filter_text:
+            # Walk backwards over newlines until enough lines are covered
+            pos = size - 1 if mm[size - 1:size] == b'\n' else size
+            for _ in range(lines_to_show):
+                pos = mm.rfind(b'\n', 0, pos)
+                if pos == -1:
+                    break
+            return mm[pos + 1:size].decode('utf-8', errors='replace').splitlines(keepends=True)
         
-        if "Average Trade:" in block:
-            try:
-                val = block.split("Average Trade:")[1].split('\n')[0].replace('$', '').replace(',', '').strip()
-                result['avg_trade'] = float(val)
-            except:
-                pass
+        # Regex search runs directly on the mapped buffer; keep only the
+        # last N matching line spans
+        pattern = re.compile(re.escape(filter_text.encode('utf-8')), re.IGNORECASE)
+        spans = deque(maxlen=lines_to_show)
+        pos = 0
+        while True:
+            match = pattern.search(mm, pos)
+            if match is None:
+                break
+            start = mm.rfind(b'\n', 0, match.start()) + 1
+            end = mm.find(b'\n', match.end())
+            end = size if end == -1 else end + 1
+            spans.append((start, end))
+            pos = end
         
-        if 'symbol' in result and 'strategy' in result and 'final_value' in result:
-            results_list.append(result)
+        return [mm[start:end].decode('utf-8', errors='replace') for start, end in spans]
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _filter_log_cached(log_mtime: float, log_size: int, filter_text: str, lines_to_show: int) -> list:
+    """Cached tail of the (optionally filtered) log lines."""
+    return tail_log_lines(LOG_PATH, lines_to_show, filter_text)
+
+
+def prebinned_histogram(values: pd.Series, bins: int, color: str) -> go.Bar:
+    """
+    Histogram trace binned server-side with NumPy.
+    
+    Only bin centers and counts are sent to the browser instead of every
+    raw value for client-side binning.
+    """
+    counts, edges = np.histogram(values.dropna().to_numpy(dtype=float), bins=bins)
+    return go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        marker_color=color,
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _histogram_fig_json(log_key: tuple, column: str, title: str, xaxis_title: str, color: str, _df: pd.DataFrame) -> str:
+    """
+    Build a distribution figure as Plotly JSON.
+    
+    Cached on log_key (the log's mtime/size) plus the styling arguments,
+    so reruns with an unchanged log skip Plotly's figure validation. Two
+    histograms per log version; older versions are evicted.
+    """
+    fig = go.Figure()
+    fig.add_trace(prebinned_histogram(_df[column], 20, color))
+    fig.update_layout(
+        title=title,
+        xaxis_title=xaxis_title,
+        yaxis_title="Frequency",
+        height=300,
+        template="plotly_dark",
+        showlegend=False
+    )
+    return fig.to_json()
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def _sharpe_return_fig_json(log_key: tuple, _df: pd.DataFrame) -> str:
+    """Sharpe vs return scatter as Plotly JSON, cached on log_key."""
+    # SVG scatter gets sluggish with many points; switch to WebGL
+    scatter_cls = go.Scattergl if len(_df) > WEBGL_MIN_POINTS else go.Scatter
+    fig = go.Figure()
+    fig.add_trace(scatter_cls(
+        x=_df['sharpe'],
+        y=_df['return'],
+        mode='markers',
+        marker=dict(
+            size=10,
+            color=_df['return'],
+            colorscale='RdYlGn',
+            showscale=True,
+            colorbar=dict(title="Return (%)")
+        ),
+        text=_df.apply(lambda row: f"{row['symbol']} - {row['strategy']}", axis=1),
+        hovertemplate='<b>%{text}</b><br>Sharpe: %{x:.3f}<br>Return: %{y:.2f}%<extra></extra>'
+    ))
+    fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
+    fig.add_vline(x=0, line_dash="dash", line_color="gray", opacity=0.5)
+    fig.update_layout(
+        title="Sharpe Ratio vs Return",
+        xaxis_title="Sharpe Ratio",
+        yaxis_title="Return (%)",
+        height=400,
+        template="plotly_dark"
+    )
+    return fig.to_json()
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def _strategy_return_fig_json(log_key: tuple, _strategy_avg: pd.Series) -> str:
+    """Average return by strategy bar chart as Plotly JSON, cached on log_key."""
+    fig = go.Figure()
+    colors = ['#00cc96' if x > 0 else '#ef553b' for x in _strategy_avg.values]
+    fig.add_trace(go.Bar(
+        x=_strategy_avg.index,
+        y=_strategy_avg.values,
+        marker_color=colors,
+        text=[f"{x:.2f}%" for x in _strategy_avg.values],
+        textposition='auto',
+    ))
+    fig.update_layout(
+        title="Average Return by Strategy",
+        xaxis_title="Strategy",
+        yaxis_title="Average Return (%)",
+        height=350,
+        template="plotly_dark",
+        showlegend=False
+    )
+    return fig.to_json()
+
+
+@st.cache_resource
+def get_results_db() -> duckdb.DuckDBPyConnection:
+    """Shared DuckDB connection holding the parsed results of the current log."""
+    RESULTS_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = duckdb.connect(str(RESULTS_DB_PATH))
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS backtests (
+            timestamp     VARCHAR NOT NULL,
+            symbol        VARCHAR NOT NULL,
+            strategy      VARCHAR NOT NULL,
+            initial_value DOUBLE,
+            final_value   DOUBLE NOT NULL,
+            pnl           DOUBLE,
+            "return"      DOUBLE,
+            sharpe        DOUBLE,
+            max_drawdown  DOUBLE,
+            total_trades  INTEGER,
+            won_trades    INTEGER,
+            lost_trades   INTEGER,
+            win_rate      DOUBLE,
+            avg_trade     DOUBLE,
+            seq           INTEGER NOT NULL,  -- position of the result in the log
+            PRIMARY KEY (timestamp, symbol, strategy, seq)
+        )
+    """)
+    # Which log the rows came from, so rotation/deletion can be detected
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS backtests_source (
+            log_inode BIGINT,
+            log_size  BIGINT
+        )
+    """)
+    return conn
+
+
+@st.cache_resource
+def get_results_db_lock() -> threading.Lock:
+    """Serializes results table syncs across sessions (they share one connection)."""
+    return threading.Lock()
+
+
+def sync_results_db(results_list: list, log_inode=None, log_size: int = 0) -> None:
+    """
+    Bring the results table in line with the current log parse.
+    
+    The log is append-only, so only results past the rows already stored
+    are inserted, in one bulk INSERT ... SELECT from an Arrow table. A
+    different or shrunken log (rotation, truncation, deletion) clears the
+    table first, so it never lists runs the Overview no longer counts.
     
-    return results_list
+    Args:
+        results_list: All results parsed from the current log
+        log_inode: Inode of the log (None when it no longer exists)
+        log_size: Size of the log the results were parsed from
+    """
+    with get_results_db_lock():
+        cursor = get_results_db().cursor()
+        try:
+            cursor.begin()
+            source = cursor.execute("SELECT log_inode, log_size FROM backtests_source").fetchone()
+            if source is None or source[0] != log_inode or log_size < source[1]:
+                if source is not None and source[0] == log_inode and LOG_PATH.exists() \
+                        and LOG_PATH.stat().st_size >= source[1]:
+                    # This session parsed an older version of the same log;
+                    # a newer sync already stored everything it has
+                    cursor.rollback()
+                    return
+                cursor.execute("DELETE FROM backtests")
+            cursor.execute("DELETE FROM backtests_source")
+            cursor.execute("INSERT INTO backtests_source VALUES (?, ?)", [log_inode, log_size])
+            
+            synced = cursor.execute("SELECT count(*) FROM backtests").fetchone()[0]
+            new_results = results_list[synced:]
+            if new_results:
+                new_table = pa.Table.from_pylist(new_results, schema=RESULTS_SCHEMA).append_column(
+                    'seq', pa.array(range(synced, synced + len(new_results)), pa.int64())
+                )
+                cursor.register('new_results', new_table)
+                cursor.execute("""
+                    INSERT INTO backtests
+                    SELECT COALESCE(timestamp, ''), * EXCLUDE (timestamp) FROM new_results
+                """)
+                cursor.unregister('new_results')
+            cursor.commit()
+        except duckdb.Error:
+            cursor.rollback()
+            raise
+        finally:
+            cursor.close()
+
 
 # Load data
-results_list = load_all_backtest_results()
+if LOG_PATH.exists():
+    log_stat = LOG_PATH.stat()
+    log_key = (log_stat.st_mtime, log_stat.st_size)
+    # Unchanged log since this session's last run: skip the loader entirely
+    if st.session_state.get('_log_key') == log_key:
+        results_list, summary = st.session_state['_results']
+    else:
+        # Parse state is per session, so this stays out of st.cache_data;
+        # fresh sessions share work through the Parquet snapshot instead
+        results_list = load_all_backtest_results()
+        summary = summarize_results(results_list)
+        st.session_state.update(_log_key=log_key, _results=(results_list, summary))
+    # Only push to DuckDB when the log changed since this session last synced
+    if st.session_state.get('_results_db_synced') != log_key:
+        sync_results_db(results_list, log_stat.st_ino, log_stat.st_size)
+        st.session_state['_results_db_synced'] = log_key
+else:
+    results_list, summary = [], summarize_results([])
+    # Log deleted: drop the rows it contributed
+    if st.session_state.get('_results_db_synced') is not None:
+        sync_results_db(results_list)
+        st.session_state['_results_db_synced'] = None
 
 if not results_list:
     st.info("No backtest results found. Run some backtests to see analysis here.")
@@ -146,37 +349,52 @@ tab1, tab2, tab3, tab4 = st.tabs(["Overview", "Comparison", "Strategy Analysis",
 with tab1:
     st.subheader("Performance Overview")
     
-    df = pd.DataFrame(results_list)
+    # Aggregates were computed alongside parsing and are cached with the results
+    avg_return = summary['avg_return']
+    best_return = summary['best_return']
+    avg_sharpe = summary['avg_sharpe']
+    avg_win_rate = summary['avg_win_rate']
     
     col1, col2, col3, col4, col5 = st.columns(5)
     
     with col1:
-        st.metric("Total Tests", len(results_list))
+        st.metric("Total Tests", summary['total_tests'])
     with col2:
-        avg_return = df['return'].mean()
-        st.metric("Avg Return", f"{avg_return:.2f}%")
+        st.metric("Avg Return", f"{avg_return:.2f}%" if avg_return is not None else "N/A")
     with col3:
-        best_return = df['return'].max()
-        st.metric("Best Return", f"{best_return:.2f}%")
+        st.metric("Best Return", f"{best_return:.2f}%" if best_return is not None else "N/A")
     with col4:
-        avg_sharpe = df['sharpe'].mean()
-        st.metric("Avg Sharpe", f"{avg_sharpe:.3f}")
+        st.metric("Avg Sharpe", f"{avg_sharpe:.3f}" if avg_sharpe is not None else "N/A")
     with col5:
-        avg_win_rate = df['win_rate'].mean()
-        st.metric("Avg Win Rate", f"{avg_win_rate:.1f}%")
+        st.metric("Avg Win Rate", f"{avg_win_rate:.1f}%" if avg_win_rate is not None else "N/A")
     
     st.subheader("Recent Tests")
-    recent_df = df.tail(20).copy()
-    recent_df = recent_df[['timestamp', 'symbol', 'strategy', 'return', 'sharpe', 'total_trades', 'win_rate']]
-    recent_df['timestamp'] = recent_df['timestamp'].apply(lambda x: x[11:19] if len(x) > 19 else x)
-    recent_df['return'] = recent_df['return'].apply(lambda x: f"{x:.2f}%")
-    recent_df['sharpe'] = recent_df['sharpe'].apply(lambda x: f"{x:.3f}")
-    recent_df['win_rate'] = recent_df['win_rate'].apply(lambda x: f"{x:.1f}%")
-    recent_df = recent_df.rename(columns={
-        'timestamp': 'Time', 'symbol': 'Symbol', 'strategy': 'Strategy',
-        'return': 'Return', 'sharpe': 'Sharpe', 'total_trades': 'Trades', 'win_rate': 'Win Rate'
-    })
-    st.dataframe(recent_df, use_container_width=True, hide_index=True, height=400)
+    db = get_results_db().cursor()
+    recent_df = db.execute("""
+        SELECT timestamp, symbol, strategy, "return", sharpe, total_trades, win_rate
+        FROM backtests
+        ORDER BY seq DESC
+        LIMIT 20
+    """).df()
+    db.close()
+    timestamps = recent_df['timestamp']
+    recent_df['timestamp'] = timestamps.str.slice(11, 19).where(timestamps.str.len() > 19, timestamps)
+    # Numeric columns stay numeric; formatting happens client-side
+    st.dataframe(
+        recent_df,
+        column_config={
+            'timestamp': st.column_config.TextColumn("Time"),
+            'symbol': st.column_config.TextColumn("Symbol"),
+            'strategy': st.column_config.TextColumn("Strategy"),
+            'return': st.column_config.NumberColumn("Return", format="%.2f%%"),
+            'sharpe': st.column_config.NumberColumn("Sharpe", format="%.3f"),
+            'total_trades': st.column_config.NumberColumn("Trades", format="%d"),
+            'win_rate': st.column_config.NumberColumn("Win Rate", format="%.1f%%"),
+        },
+        use_container_width=True,
+        hide_index=True,
+        height=400
+    )
 
 with tab2:
     st.subheader("Performance Comparisons")
@@ -187,55 +405,18 @@ with tab2:
         col1, col2 = st.columns(2)
         
         with col1:
-            fig = go.Figure()
-            fig.add_trace(go.Histogram(x=df['return'], nbinsx=20, marker_color='#636EFA'))
-            fig.update_layout(
-                title="Returns Distribution",
-                xaxis_title="Return (%)",
-                yaxis_title="Frequency",
-                height=300,
-                template="plotly_dark",
-                showlegend=False
-            )
+            fig = go.Figure(json.loads(_histogram_fig_json(
+                log_key, 'return', "Returns Distribution", "Return (%)", '#636EFA', df
+            )))
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
-            fig = go.Figure()
-            fig.add_trace(go.Histogram(x=df['win_rate'], nbinsx=20, marker_color='#00cc96'))
-            fig.update_layout(
-                title="Win Rate Distribution",
-                xaxis_title="Win Rate (%)",
-                yaxis_title="Frequency",
-                height=300,
-                template="plotly_dark",
-                showlegend=False
-            )
+            fig = go.Figure(json.loads(_histogram_fig_json(
+                log_key, 'win_rate', "Win Rate Distribution", "Win Rate (%)", '#00cc96', df
+            )))
             st.plotly_chart(fig, use_container_width=True)
         
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=df['sharpe'],
-            y=df['return'],
-            mode='markers',
-            marker=dict(
-                size=10,
-                color=df['return'],
-                colorscale='RdYlGn',
-                showscale=True,
-                colorbar=dict(title="Return (%)")
-            ),
-            text=df.apply(lambda row: f"{row['symbol']} - {row['strategy']}", axis=1),
-            hovertemplate='<b>%{text}</b><br>Sharpe: %{x:.3f}<br>Return: %{y:.2f}%<extra></extra>'
-        ))
-        fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
-        fig.add_vline(x=0, line_dash="dash", line_color="gray", opacity=0.5)
-        fig.update_layout(
-            title="Sharpe Ratio vs Return",
-            xaxis_title="Sharpe Ratio",
-            yaxis_title="Return (%)",
-            height=400,
-            template="plotly_dark"
-        )
+        fig = go.Figure(json.loads(_sharpe_return_fig_json(log_key, df)))
         st.plotly_chart(fig, use_container_width=True)
 
 with tab3:
@@ -257,45 +438,23 @@ with tab3:
             
             strategy_avg = df.groupby('strategy')['return'].mean().sort_values(ascending=False)
             
-            fig = go.Figure()
-            colors = ['#00cc96' if x > 0 else '#ef553b' for x in strategy_avg.values]
-            fig.add_trace(go.Bar(
-                x=strategy_avg.index,
-                y=strategy_avg.values,
-                marker_color=colors,
-                text=[f"{x:.2f}%" for x in strategy_avg.values],
-                textposition='auto',
-            ))
-            fig.update_layout(
-                title="Average Return by Strategy",
-                xaxis_title="Strategy",
-                yaxis_title="Average Return (%)",
-                height=350,
-                template="plotly_dark",
-                showlegend=False
-            )
+            fig = go.Figure(json.loads(_strategy_return_fig_json(log_key, strategy_avg)))
             st.plotly_chart(fig, use_container_width=True)
 
 with tab4:
     st.subheader("System Logs")
     
-    log_path = Path("logs/wawastock.log")
-    if log_path.exists():
+    if LOG_PATH.exists():
         col1, col2 = st.columns([2, 1])
         with col1:
             filter_text = st.text_input("Filter logs", placeholder="e.g. ERROR, backtest, symbol")
         with col2:
             lines_to_show = st.number_input("Lines to display", value=100, min_value=10, max_value=1000, step=50)
         
-        with open(log_path, 'r') as f:
-            all_lines = f.readlines()
-        
-        if filter_text:
-            filtered_lines = [line for line in all_lines if filter_text.lower() in line.lower()]
-        else:
-            filtered_lines = all_lines
-        
-        recent_lines = filtered_lines[-lines_to_show:]
+        log_stat = LOG_PATH.stat()
+        recent_lines = _filter_log_cached(
+            log_stat.st_mtime, log_stat.st_size, filter_text, int(lines_to_show)
+        )
         
         st.text_area(
             f"Showing last {len(recent_lines)} lines",
@@ -305,7 +464,7 @@ with tab4:
         )
         
         from datetime import datetime
-        log_content = ''.join(all_lines)
+        log_content = _read_log_cached(log_stat.st_mtime, log_stat.st_size)
         st.download_button(
             label="📥 Download Full Log",
             data=log_content,
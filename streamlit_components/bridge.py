@@ -5,10 +5,16 @@ This module provides the interface layer that connects the Streamlit UI
 with the core WawaStock engines (DataEngine, BacktestEngine) and registries.
 """
 
+import functools
+import os
+import re
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 import pandas as pd
+import pyarrow.dataset as ds
 import streamlit as st
 
 # Add project root to path
@@ -18,6 +24,135 @@ from engines.data_engine import DataEngine
 from engines.backtest_engine import BacktestEngine
 from engines.report_engine import ReportEngine
 
+# Processed single-file data, one {symbol}.parquet per symbol
+PROCESSED_DIR = Path(__file__).parent.parent / 'data' / 'processed'
+
+# Matches indicator columns written by IndicatorsEngine
+_INDICATOR_COL_RE = re.compile(r'SMA_|EMA_|RSI_|MACD')
+
+
+@functools.lru_cache(maxsize=256)
+def _extract_params(strategy_cls: type) -> tuple:
+    """
+    Extract (name, default) parameter pairs from a strategy class.
+    
+    Registries are process-constant, so this is computed once per class.
+    
+    Args:
+        strategy_cls: Backtrader strategy class
+        
+    Returns:
+        Tuple of (param_name, default_value) pairs
+    """
+    pairs = []
+    
+    # Extract params from backtrader strategy
+    if hasattr(strategy_cls, 'params'):
+        params = strategy_cls.params
+        # params can be a tuple of tuples or an instance
+        if hasattr(params, '_getitems'):
+            # It's a backtrader params object
+            for param_name in params._getkeys():
+                pairs.append((param_name, getattr(params, param_name)))
+        elif isinstance(params, (tuple, list)):
+            # It's a tuple/list of tuples
+            for param_tuple in params:
+                if len(param_tuple) >= 2:
+                    pairs.append((param_tuple[0], param_tuple[1]))
+    
+    return tuple(pairs)
+
+
+@functools.lru_cache(maxsize=256)
+def _extract_recipe_info(recipe_name: str, recipe_cls: type) -> tuple:
+    """
+    Build (key, value) info pairs for a recipe class, computed once per class.
+    
+    Args:
+        recipe_name: Registry name of the recipe
+        recipe_cls: Recipe class
+        
+    Returns:
+        Tuple of (key, value) pairs (name, class, doc)
+    """
+    return (
+        ('name', recipe_name),
+        ('class', recipe_cls.__name__),
+        ('doc', recipe_cls.__doc__ or "No description available"),
+    )
+
+
+# Set by _run_recipe_cached's body, which only executes on a cache miss
+_recipe_run_state = threading.local()
+
+
+@st.cache_data(show_spinner=False, max_entries=16, ttl=3600)
+def _run_recipe_cached(
+    recipe_name: str,
+    symbol: str,
+    start: str,
+    end: str,
+    initial_cash: float,
+    commission: float,
+    params: tuple,
+    data_mtime: float,
+) -> Dict[str, Any]:
+    """
+    Run a recipe through main.py, memoized per unique configuration.
+    
+    Streamlit reruns the whole script on every widget change; caching on
+    (recipe, symbol, range, capital, commission, params) means only a new
+    configuration triggers a fresh backtest.
+    
+    Args:
+        params: Strategy parameters as a sorted tuple of (name, value) pairs
+        data_mtime: mtime of the symbol's processed parquet (0 if absent), so
+            re-downloaded prices invalidate the entry
+        
+    Returns:
+        Picklable results dict (metrics and price DataFrame, no Strategy)
+    """
+    _recipe_run_state.fresh = True
+    
+    # Import the programmatic runner from main.py
+    from main import run_recipe_programmatic
+    
+    # Call main.py's function directly - NO DUPLICATION
+    results = run_recipe_programmatic(
+        recipe_name=recipe_name,
+        symbol=symbol,
+        start=start,
+        end=end,
+        cash=initial_cash,
+        commission=commission,
+        **dict(params)
+    )
+    
+    # cache_data pickles the return value; the live backtrader Strategy
+    # (which holds the logger's open file handle) cannot be pickled
+    strategy = results.pop('strategy', None)
+    results['strategy_name'] = type(strategy).__name__ if strategy is not None else 'N/A'
+    return results
+
+
+def _log_cached_results(results: Dict[str, Any], initial_cash: float, commission: float) -> None:
+    """Log the metrics block for a cache hit, as the skipped backtest would have."""
+    BacktestEngine(initial_cash=initial_cash, commission=commission).log_results(
+        results.get('symbol'),
+        results.get('strategy_name', 'N/A'),
+        results.get('initial_value', 0),
+        results.get('final_value', 0),
+        results.get('total_pnl', 0),
+        results.get('total_return', 0),
+        {
+            'sharpe': results.get('sharpe_ratio'),
+            'max_drawdown': results.get('max_drawdown'),
+            'total_trades': results.get('total_trades', 0),
+            'won_trades': results.get('won_trades', 0),
+            'lost_trades': results.get('lost_trades', 0),
+        },
+    )
+
 
 class StreamlitBridge:
     """
@@ -60,12 +195,7 @@ class StreamlitBridge:
         if recipe_name not in registry:
             return {}
         
-        recipe_cls = registry[recipe_name]
-        return {
-            'name': recipe_name,
-            'class': recipe_cls.__name__,
-            'doc': recipe_cls.__doc__ or "No description available",
-        }
+        return dict(_extract_recipe_info(recipe_name, registry[recipe_name]))
     
     def get_strategy_params(self, strategy_name: str) -> Dict[str, Any]:
         """
@@ -81,27 +211,7 @@ class StreamlitBridge:
         if strategy_name not in registry:
             return {}
         
-        strategy_cls = registry[strategy_name]
-        params_dict = {}
-        
-        # Extract params from backtrader strategy
-        if hasattr(strategy_cls, 'params'):
-            params = strategy_cls.params
-            # params can be a tuple of tuples or an instance
-            if hasattr(params, '_getitems'):
-                # It's a backtrader params object
-                for param_name in params._getkeys():
-                    default_value = getattr(params, param_name)
-                    params_dict[param_name] = default_value
-            elif isinstance(params, (tuple, list)):
-                # It's a tuple/list of tuples
-                for param_tuple in params:
-                    if len(param_tuple) >= 2:
-                        param_name = param_tuple[0]
-                        default_value = param_tuple[1]
-                        params_dict[param_name] = default_value
-        
-        return params_dict
+        return dict(_extract_params(registry[strategy_name]))
     
     def load_data(
         self,
@@ -158,20 +268,35 @@ class StreamlitBridge:
             Dictionary with backtest results or None if failed
         """
         try:
-            # Import the programmatic runner from main.py
-            from main import run_recipe_programmatic
+            # number_input widgets yield floats; restore integral values to
+            # int so backtrader periods/sizes receive the expected type
+            cleaned_params = {
+                k: (int(v) if type(v) is float and v.is_integer() else v)
+                for k, v in strategy_params.items()
+            }
             
-            # Call main.py's function directly - NO DUPLICATION
-            results = run_recipe_programmatic(
-                recipe_name=recipe_name,
-                symbol=symbol,
-                start=start,
-                end=end,
-                cash=initial_cash,
-                commission=commission,
-                **strategy_params
+            processed_path = PROCESSED_DIR / f'{symbol}.parquet'
+            data_mtime = processed_path.stat().st_mtime if processed_path.exists() else 0.0
+            
+            # Identical configurations on unchanged data are served from the
+            # Streamlit cache
+            _recipe_run_state.fresh = False
+            results = _run_recipe_cached(
+                recipe_name,
+                symbol,
+                start,
+                end,
+                initial_cash,
+                commission,
+                tuple(sorted(cleaned_params.items())),
+                data_mtime,
             )
             
+            # The Analysis page counts runs from the log, so a cache hit
+            # still writes its result block
+            if not _recipe_run_state.fresh:
+                _log_cached_results(results, initial_cash, commission)
+            
             return results
             
         except Exception as e:
@@ -261,18 +386,19 @@ class StreamlitBridge:
             List of symbol names sorted by relevance
         """
         try:
-            processed_dir = Path(__file__).parent.parent / 'data' / 'processed'
-            if not processed_dir.exists():
+            if not PROCESSED_DIR.exists():
                 return []
             
             # Common/popular symbols for prioritization
             popular = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'TSLA', 'META', 'SPY', 'QQQ']
             
             symbol_info = []
-            for file in processed_dir.glob('*.parquet'):
-                symbol = file.stem
+            with os.scandir(PROCESSED_DIR) as it:
+                entries = [e for e in it if e.name.endswith('.parquet')]
+            for entry in entries:
+                symbol = entry.name[:-len('.parquet')]
                 # Get file modification time as proxy for data recency
-                mtime = file.stat().st_mtime
+                mtime = entry.stat().st_mtime
                 is_popular = symbol in popular
                 
                 symbol_info.append({
@@ -306,21 +432,58 @@ class StreamlitBridge:
             Dictionary with symbol info (rows, date range, size, etc.)
         """
         try:
-            df = self.data_engine.load_prices(symbol, start='1900-01-01', end='2100-01-01')
-            if df is None or df.empty:
+            processed_path = PROCESSED_DIR / f'{symbol}.parquet'
+            if not processed_path.exists():
                 return None
             
-            processed_path = Path(__file__).parent.parent / 'data' / 'processed' / f'{symbol}.parquet'
-            file_size = processed_path.stat().st_size if processed_path.exists() else 0
+            # Only the date column is read from disk; everything else comes
+            # from the parquet schema/footer
+            dataset = ds.dataset(str(processed_path), format='parquet')
+            names = dataset.schema.names
+            names_set = frozenset(names)
+            date_col = next((c for c in ('datetime', 'timestamp') if c in names_set), names[0])
+            table = dataset.to_table(columns=[date_col])
+            if table.num_rows == 0:
+                return None
+            
+            dates = table.column(0).to_pandas()
+            if pd.api.types.is_numeric_dtype(dates):
+                dates = pd.to_datetime(dates, unit='s', errors='coerce')
+            else:
+                dates = pd.to_datetime(dates, errors='coerce')
+            
+            skip = frozenset((date_col, 'index', '__index_level_0__'))
+            columns = [c for c in names if c not in skip]
             
             return {
                 'symbol': symbol,
-                'rows': len(df),
-                'start_date': str(df.index[0].date()) if len(df) > 0 else 'N/A',
-                'end_date': str(df.index[-1].date()) if len(df) > 0 else 'N/A',
-                'columns': list(df.columns),
-                'file_size': file_size,
-                'has_indicators': any(col.startswith(('SMA_', 'EMA_', 'RSI_', 'MACD')) for col in df.columns),
+                'rows': table.num_rows,
+                'start_date': str(dates.min().date()),
+                'end_date': str(dates.max().date()),
+                'columns': columns,
+                'file_size': processed_path.stat().st_size,
+                'has_indicators': any(_INDICATOR_COL_RE.match(col) for col in columns),
             }
         except Exception:
             return None
+    
+    def get_symbol_infos(self, symbols: List[str], max_workers: int = 8) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get information about several symbols concurrently.
+        
+        Parquet I/O is I/O-bound (pyarrow releases the GIL), so lookups
+        run on a thread pool.
+        
+        Args:
+            symbols: Symbol names
+            max_workers: Maximum number of worker threads
+            
+        Returns:
+            Dictionary mapping each symbol to its info (or None if unavailable)
+        """
+        if not symbols:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols))) as executor:
+            infos = executor.map(self.get_symbol_info, symbols)
+            return dict(zip(symbols, infos))
@@ -4,12 +4,49 @@ Chart components for Streamlit UI.
 Provides interactive charts using Plotly for visualizing backtest results.
 """
 
+import json
+import re
+
+import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 import streamlit as st
 from typing import Optional, List, Dict, Any
 
+from utils._njit import njit, NUMBA_AVAILABLE
+
+# Column prefixes treated as indicators, compiled once into a single regex
+INDICATOR_PREFIXES = ['SMA_', 'EMA_', 'BB', 'RSI', 'MACD', 'ATR', 'OBV', 'STOCH', 'VWAP']
+_INDICATOR_PREFIX_RE = re.compile('|'.join(map(re.escape, INDICATOR_PREFIXES)))
+
+
+@njit(cache=True, error_model='numpy')
+def _drawdown_kernel(vals: np.ndarray) -> np.ndarray:
+    """
+    Running-peak drawdown (%) in a single fused pass.
+    
+    Matches ``_drawdown_numpy``: NaN never becomes the peak and a zero peak
+    yields nan/inf instead of raising.
+    """
+    out = np.empty_like(vals)
+    if vals.size == 0:
+        return out
+    m = vals[0]
+    for i in range(vals.size):
+        if vals[i] > m or m != m:
+            m = vals[i]
+        out[i] = (vals[i] - m) / m * 100.0
+    return out
+
+
+def _drawdown_numpy(vals: np.ndarray) -> np.ndarray:
+    """Running-peak drawdown (%) with NumPy ufuncs (fallback without Numba)."""
+    # fmax skips NaN like Series.cummax(), so one gap doesn't blank the rest
+    cummax = np.fmax.accumulate(vals)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (vals - cummax) / cummax * 100.0
+
 
 def plot_equity_curve(results: Dict[str, Any]) -> Optional[go.Figure]:
     """
@@ -35,6 +72,9 @@ def plot_price_chart(
     """
     Plot candlestick chart with optional indicators.
     
+    The figure is built once per (data, symbol, indicators) and served
+    from the Streamlit cache as JSON on subsequent reruns.
+    
     Args:
         df: DataFrame with OHLCV data
         symbol: Symbol name
@@ -43,6 +83,30 @@ def plot_price_chart(
     Returns:
         Plotly figure
     """
+    # Content hash (index + every value), so re-downloaded or adjusted
+    # prices with the same dates never hit a stale figure
+    df_key = (int(pd.util.hash_pandas_object(df, index=True).sum()), tuple(df.columns))
+    
+    fig_json = _build_price_fig_json(df_key, symbol, tuple(indicators or ()), df)
+    return go.Figure(json.loads(fig_json))
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _build_price_fig_json(
+    df_key: tuple,
+    symbol: str,
+    indicators: tuple,
+    _df: pd.DataFrame
+) -> str:
+    """
+    Build the price chart figure and return it serialized as JSON.
+    
+    ``_df`` is excluded from Streamlit's argument hashing; ``df_key``
+    (content hash and columns) identifies the data instead.
+    """
+    df = _df
+    cols_set = frozenset(df.columns.to_list())
+    
     # Create figure with secondary y-axis
     fig = make_subplots(
         rows=2, cols=1,
@@ -52,14 +116,24 @@ def plot_price_chart(
         row_heights=[0.7, 0.3]
     )
     
+    # Up/down is decided on full precision: float32 rounding could flip
+    # near-equal open/close pairs
+    open64 = df['open'].to_numpy(dtype=np.float64)
+    close64 = df['close'].to_numpy(dtype=np.float64)
+    up = (close64 >= open64).astype(np.int8)
+    
+    # float32 is plenty for display and halves the JSON payload sent to the browser
+    opens = open64.astype(np.float32)
+    closes = close64.astype(np.float32)
+    
     # Candlestick
     fig.add_trace(
         go.Candlestick(
             x=df.index,
-            open=df['open'],
-            high=df['high'],
-            low=df['low'],
-            close=df['close'],
+            open=opens,
+            high=df['high'].to_numpy(dtype=np.float32),
+            low=df['low'].to_numpy(dtype=np.float32),
+            close=closes,
             name='OHLC'
         ),
         row=1, col=1
@@ -68,7 +142,7 @@ def plot_price_chart(
     # Add indicators if specified
     if indicators:
         for indicator in indicators:
-            if indicator in df.columns:
+            if indicator in cols_set:
                 fig.add_trace(
                     go.Scatter(
                         x=df.index,
@@ -79,16 +153,19 @@ def plot_price_chart(
                     row=1, col=1
                 )
     
-    # Volume bars
-    colors = ['red' if close < open else 'green' 
-              for close, open in zip(df['close'], df['open'])]
-    
+    # Volume bars: 0/1 up-flag mapped through a two-color scale, so only
+    # small ints travel to the browser instead of one string per bar
     fig.add_trace(
         go.Bar(
             x=df.index,
-            y=df['volume'],
+            y=df['volume'].to_numpy(dtype=np.float32),
             name='Volume',
-            marker_color=colors,
+            marker=dict(
+                color=up,
+                colorscale=[[0, 'red'], [1, 'green']],
+                cmin=0,
+                cmax=1
+            ),
             showlegend=False
         ),
         row=2, col=1
@@ -106,7 +183,7 @@ def plot_price_chart(
     fig.update_yaxes(title_text="Price", row=1, col=1)
     fig.update_yaxes(title_text="Volume", row=2, col=1)
     
-    return fig
+    return fig.to_json()
 
 
 def plot_returns_distribution(returns: pd.Series) -> go.Figure:
@@ -152,15 +229,15 @@ def plot_drawdown(equity_curve: pd.Series) -> go.Figure:
     Returns:
         Plotly figure
     """
-    # Calculate drawdown
-    cummax = equity_curve.cummax()
-    drawdown = (equity_curve - cummax) / cummax * 100
+    # Calculate drawdown on the raw values (avoids pandas Series overhead)
+    vals = equity_curve.to_numpy(dtype=np.float64)
+    drawdown = _drawdown_kernel(vals) if NUMBA_AVAILABLE else _drawdown_numpy(vals)
     
     fig = go.Figure()
     
     fig.add_trace(
         go.Scatter(
-            x=drawdown.index,
+            x=equity_curve.index,
             y=drawdown,
             fill='tozeroy',
             name='Drawdown',
@@ -228,12 +305,8 @@ def create_indicator_selector(df: pd.DataFrame) -> List[str]:
         List of selected indicator column names
     """
     # Find indicator columns
-    indicator_cols = []
-    indicator_prefixes = ['SMA_', 'EMA_', 'BB', 'RSI', 'MACD', 'ATR', 'OBV', 'STOCH', 'VWAP']
-    
-    for col in df.columns:
-        if any(col.startswith(prefix) for prefix in indicator_prefixes):
-            indicator_cols.append(col)
+    cols = df.columns.to_list()
+    indicator_cols = [col for col in cols if _INDICATOR_PREFIX_RE.match(col)]
     
     if not indicator_cols:
         return []
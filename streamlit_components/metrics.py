@@ -8,6 +8,20 @@ import streamlit as st
 from typing import Dict, Any
 
 
+# HTML for display_summary_card, filled via str.format_map
+_SUMMARY_TMPL = """
+    <div style='padding: 1rem; border-radius: 0.5rem; background-color: rgba(0,0,0,0.05); border-left: 4px solid {color};'>
+        <h3 style='margin: 0;'>{emoji} Backtest Summary</h3>
+        <p style='margin: 0.5rem 0;'>
+            <strong>Symbol:</strong> {symbol}<br>
+            <strong>Period:</strong> {period}<br>
+            <strong>Return:</strong> <span style='color: {color}; font-size: 1.2em; font-weight: bold;'>{total_return:.2f}%</span><br>
+            <strong>P&L:</strong> ${profit_loss:,.2f}
+        </p>
+    </div>
+    """
+
+
 def display_performance_metrics(results: Dict[str, Any]):
     """
     Display key performance metrics in metric cards.
@@ -141,14 +155,11 @@ def display_summary_card(results: Dict[str, Any]):
         emoji = "⚠️"
         color = "red"
     
-    st.markdown(f"""
-    <div style='padding: 1rem; border-radius: 0.5rem; background-color: rgba(0,0,0,0.05); border-left: 4px solid {color};'>
-        <h3 style='margin: 0;'>{emoji} Backtest Summary</h3>
-        <p style='margin: 0.5rem 0;'>
-            <strong>Symbol:</strong> {results.get('symbol', 'N/A')}<br>
-            <strong>Period:</strong> {results.get('period', 'N/A')}<br>
-            <strong>Return:</strong> <span style='color: {color}; font-size: 1.2em; font-weight: bold;'>{total_return:.2f}%</span><br>
-            <strong>P&L:</strong> ${profit_loss:,.2f}
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_SUMMARY_TMPL.format_map({
+        'color': color,
+        'emoji': emoji,
+        'symbol': results.get('symbol', 'N/A'),
+        'period': results.get('period', 'N/A'),
+        'total_return': total_return,
+        'profit_loss': profit_loss,
+    }), unsafe_allow_html=True)
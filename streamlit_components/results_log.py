@@ -0,0 +1,231 @@
+"""
+Backtest results parsed from the application log.
+
+BacktestEngine writes one "COMPLETE METRICS" block per run to
+``logs/wawastock.log``; this module turns those blocks into result dicts
+for the Analysis page, parsing incrementally and snapshotting to Parquet.
+"""
+
+import re
+import uuid
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+LOG_PATH = Path("logs/wawastock.log")
+RESULTS_MARKER = "BACKTEST RESULTS - COMPLETE METRICS"
+BLOCK_SEPARATOR = "=" * 60
+RESULTS_PARQUET_PATH = Path("logs/results.parquet")
+
+RESULTS_SCHEMA = pa.schema([
+    ('timestamp', pa.string()),
+    ('symbol', pa.string()),
+    ('strategy', pa.string()),
+    ('initial_value', pa.float64()),
+    ('final_value', pa.float64()),
+    ('pnl', pa.float64()),
+    ('return', pa.float64()),
+    ('sharpe', pa.float64()),
+    ('max_drawdown', pa.float64()),
+    ('total_trades', pa.int64()),
+    ('won_trades', pa.int64()),
+    ('lost_trades', pa.int64()),
+    ('win_rate', pa.float64()),
+    ('avg_trade', pa.float64()),
+])
+
+# One pass over each block picks up every "Label: value" metric line
+FIELD_RE = re.compile(
+    r"(?P<key>Symbol|Strategy|Initial Capital|Final Value|Total P&L|Total Return|"
+    r"Sharpe Ratio|Max Drawdown|Total Trades|Won Trades|Lost Trades|Win Rate|Average Trade)"
+    r":[ \t]*\$?(?P<value>[^\n%]*?)%?[ \t]*$",
+    re.M,
+)
+TIMESTAMP_RE = re.compile(r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\s*\|")
+
+# Log label -> (result key, converter)
+CONVERTERS = {
+    'Symbol': ('symbol', str),
+    'Strategy': ('strategy', str),
+    'Initial Capital': ('initial_value', float),
+    'Final Value': ('final_value', float),
+    'Total P&L': ('pnl', float),
+    'Total Return': ('return', float),
+    'Sharpe Ratio': ('sharpe', float),
+    'Max Drawdown': ('max_drawdown', float),
+    'Total Trades': ('total_trades', int),
+    'Won Trades': ('won_trades', int),
+    'Lost Trades': ('lost_trades', int),
+    'Win Rate': ('win_rate', float),
+    'Average Trade': ('avg_trade', float),
+}
+
+
+def parse_result_blocks(text: str) -> list:
+    """
+    Parse backtest result blocks out of raw log text.
+    
+    All metric lines of all blocks are matched by a single compiled regex
+    (pandas ``str.extractall``) and converted column-wise.
+    
+    Args:
+        text: Log text
+    
+    Returns:
+        List of result dicts (only fields found in each block are set)
+    """
+    blocks = pd.Series(text.split(RESULTS_MARKER)[1:], dtype=object)
+    if blocks.empty:
+        return []
+    blocks.index.name = 'block'
+    
+    # First occurrence of each label per block, one column per label
+    matches = blocks.str.extractall(FIELD_RE).reset_index()
+    values = (
+        matches.drop_duplicates(['block', 'key'])
+        .pivot(index='block', columns='key', values='value')
+        .reindex(blocks.index)
+    )
+    
+    columns = {'timestamp': blocks.str.extract(TIMESTAMP_RE, expand=False)}
+    for label, (name, convert) in CONVERTERS.items():
+        raw = values[label] if label in values else pd.Series(index=blocks.index, dtype=object)
+        if convert is str:
+            columns[name] = raw.str.strip()
+        else:
+            numeric = pd.to_numeric(raw.str.replace(',', '', regex=False), errors='coerce')
+            columns[name] = numeric.round().astype('Int64') if convert is int else numeric
+    
+    df = pd.DataFrame(columns)
+    df = df.dropna(subset=['symbol', 'strategy', 'final_value'])
+    
+    return [
+        {k: v for k, v in row.items() if not pd.isna(v)}
+        for row in df.to_dict('records')
+    ]
+
+
+def split_parsed_text(text: str) -> tuple:
+    """
+    Split log text into the part that can be parsed now and the carry-over.
+    
+    The carry-over is the unfinished last block, or otherwise the text after
+    the last closing separator trimmed to ``len(RESULTS_MARKER) - 1``
+    characters, enough to hold a marker cut off mid-write.
+    
+    Args:
+        text: Carried-over text plus newly read log text
+    
+    Returns:
+        Tuple of (complete_text, pending)
+    """
+    keep = len(RESULTS_MARKER) - 1
+    last = text.rfind(RESULTS_MARKER)
+    if last == -1:
+        # No block open; only a marker prefix at the very end can matter
+        return '', text[-keep:]
+    
+    opening = text.find(BLOCK_SEPARATOR, last)
+    closing = text.find(BLOCK_SEPARATOR, opening + len(BLOCK_SEPARATOR)) if opening != -1 else -1
+    if closing == -1:
+        # Last block is still being written; carry it over whole
+        return text[:last], text[last:]
+    
+    end = closing + len(BLOCK_SEPARATOR)
+    tail = text[end:]
+    return text[:end], tail[-keep:] if len(tail) > keep else tail
+
+
+def load_all_backtest_results():
+    """
+    Load all backtest results from logs.
+    
+    The log is append-only, so only text written since the previous call is
+    parsed; the parse state (offset, unfinished block, results) is kept in
+    ``st.session_state``.
+    """
+    if not LOG_PATH.exists():
+        return []
+    
+    stat = LOG_PATH.stat()
+    state = st.session_state.get('_log_parse_state')
+    if state is None or state['inode'] != stat.st_ino or stat.st_size < state['size']:
+        # First call, or the log was rotated/truncated: start over
+        state = {'inode': stat.st_ino, 'offset': 0, 'size': 0, 'pending': '', 'results': []}
+        st.session_state['_log_parse_state'] = state
+        
+        # Resume from the Parquet snapshot when it was taken from this log;
+        # only text written after it still needs parsing
+        snapshot = read_results_parquet(RESULTS_PARQUET_PATH) if RESULTS_PARQUET_PATH.exists() else None
+        if snapshot is not None:
+            results, meta = snapshot
+            if meta['inode'] == stat.st_ino and meta['offset'] <= stat.st_size:
+                state.update(
+                    offset=meta['offset'],
+                    size=meta['offset'],
+                    pending=meta['pending'],
+                    results=results,
+                )
+    
+    if stat.st_size == state['size']:
+        return state['results']
+    
+    with open(LOG_PATH, 'r') as f:
+        f.seek(state['offset'])
+        new = f.read()
+        state['offset'] = f.tell()
+    state['size'] = stat.st_size
+    
+    complete, state['pending'] = split_parsed_text(state['pending'] + new)
+    new_results = parse_result_blocks(complete)
+    state['results'].extend(new_results)
+    
+    # The snapshot records where parsing stopped, so it stays exact and only
+    # needs rewriting when it would gain results
+    if new_results:
+        write_results_parquet(
+            state['results'], RESULTS_PARQUET_PATH,
+            inode=state['inode'], offset=state['offset'], pending=state['pending'],
+        )
+    
+    return state['results']
+
+
+def write_results_parquet(
+    results_list: list,
+    path: Path,
+    inode: int = 0,
+    offset: int = 0,
+    pending: str = ''
+) -> None:
+    """
+    Persist parsed results as a typed Parquet snapshot.
+    
+    The parse position (log inode, read offset, carry-over text) goes into
+    the schema metadata so a new session can resume from it.
+    """
+    metadata = {'inode': str(inode), 'offset': str(offset), 'pending': pending}
+    table = pa.Table.from_pylist(results_list, schema=RESULTS_SCHEMA.with_metadata(metadata))
+    # Unique name: concurrent sessions may snapshot at the same time
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    pq.write_table(table, tmp_path)
+    tmp_path.replace(path)
+
+
+def read_results_parquet(path: Path) -> tuple:
+    """Load a Parquet results snapshot back into (result dicts, parse position)."""
+    table = pq.read_table(path)
+    metadata = table.schema.metadata or {}
+    results = [
+        {k: v for k, v in row.items() if v is not None}
+        for row in table.to_pylist()
+    ]
+    meta = {
+        'inode': int(metadata.get(b'inode', b'-1')),
+        'offset': int(metadata.get(b'offset', b'0')),
+        'pending': metadata.get(b'pending', b'').decode(),
+    }
+    return results, meta
@@ -2,16 +2,32 @@
 Pytest configuration and fixtures.
 """
 
+import os
 import pytest
 import sys
 from pathlib import Path
 import tempfile
 import shutil
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 
+def pytest_configure(config):
+    """Keep tests from configuring the default file logger."""
+    # Runs before collection, so module-level get_logger() calls
+    # (e.g. in main.py) find the logger already "initialized" with no sinks
+    from loguru import logger
+    import utils.logger
+    
+    logger.remove()
+    utils.logger._INITIALIZED = True
+
+
 @pytest.fixture
 def temp_dir():
     """Create a temporary directory for tests."""
@@ -21,57 +37,145 @@ def temp_dir():
 
 
 @pytest.fixture
-def sample_ohlcv_data():
-    """Sample OHLCV data for testing."""
-    import pandas as pd
-    import numpy as np
-    from datetime import datetime, timedelta
+def store_paths(temp_dir):
+    """Parquet root path for an in-memory LocalDataStoreV2 under temp_dir."""
+    return SimpleNamespace(parquet=str(Path(temp_dir) / "parquet"))
+
+
+@pytest.fixture(scope="session")
+def local_store(request, tmp_path_factory):
+    """
+    LocalDataStoreV2 on a temporary directory, one per test process.
+    
+    Under pytest-xdist every worker gets its own DuckDB file and parquet
+    root, so workers never share a catalog; callers must clean it per test.
+    """
+    from engines.local_data_store_v2 import LocalDataStoreV2
+    
+    # "gw0", "gw1", ... under pytest-xdist; "master" otherwise
+    worker_id = getattr(request.config, "workerinput", {}).get("workerid", "master")
     
-    dates = [datetime(2023, 1, 1) + timedelta(days=i) for i in range(100)]
+    store = LocalDataStoreV2(
+        duckdb_path=str(tmp_path_factory.mktemp(f"ddb_{worker_id}") / "store.duckdb"),
+        base_dir=str(tmp_path_factory.mktemp(f"pq_{worker_id}"))
+    )
+    
+    yield store
+    
+    store.conn.close()
+
+
+def make_ohlcv_data(n=100, seed=42):
+    """
+    Generate a synthetic daily OHLCV random walk.
+    
+    Args:
+        n: Number of bars
+        seed: Random seed
+    
+    Returns:
+        DataFrame with timestamp, open, high, low, close and volume columns
+    """
+    timestamps = pd.date_range('2023-01-01', periods=n, freq='D', tz='UTC')
+    
+    rng = np.random.default_rng(seed)  # Reproducible
     
     # Generate realistic price movement with random walk
-    np.random.seed(42)  # Reproducible
     base_price = 100.0
-    price_changes = np.random.randn(100) * 2  # Random walk
+    price_changes = rng.standard_normal(n) * 2  # Random walk
     prices = base_price + np.cumsum(price_changes)
     prices = np.maximum(prices, 50.0)  # Keep positive
     
-    data = {
-        'timestamp': dates,
-        'open': [],
-        'high': [],
-        'low': [],
+    # Generate realistic OHLC (2% daily range), vectorized over all bars
+    daily_range = prices * 0.02
+    highs = prices + rng.uniform(0, daily_range)
+    lows = prices - rng.uniform(0, daily_range)
+    opens = rng.uniform(lows, highs)
+    
+    return pd.DataFrame({
+        'timestamp': timestamps,
+        'open': opens,
+        'high': highs,
+        'low': lows,
         'close': prices,
-        'volume': [np.random.randint(1000000, 5000000) for _ in range(100)]
-    }
-    
-    # Generate realistic OHLC
-    for close_price in prices:
-        daily_range = close_price * 0.02  # 2% daily range
-        high = close_price + np.random.uniform(0, daily_range)
-        low = close_price - np.random.uniform(0, daily_range)
-        open_price = np.random.uniform(low, high)
-        
-        data['open'].append(open_price)
-        data['high'].append(high)
-        data['low'].append(low)
-    
-    df = pd.DataFrame(data)
-    df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True)
+        'volume': rng.integers(1_000_000, 5_000_000, n),
+    })
+
+
+@pytest.fixture(scope="session")
+def sample_ohlcv_data(request):
+    """
+    Sample OHLCV data for testing, generated once per test session.
+    
+    The frame is persisted as Parquet in the pytest cache and read back on
+    later runs (``pytest --cache-clear`` regenerates it). Shared across
+    tests: copy it before mutating.
+    """
+    cache = getattr(request.config, "cache", None)
+    if cache is None:  # cacheprovider plugin disabled
+        return make_ohlcv_data(100)
+    
+    # Bump the version whenever make_ohlcv_data's output changes
+    path = Path(cache.mkdir("ohlcv")) / "sample_v1_n100_seed42.parquet"
+    if path.exists():
+        return pd.read_parquet(path)
     
+    df = make_ohlcv_data(100)
+    # Write-then-rename so parallel workers never read a partial file
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    df.to_parquet(tmp_path, compression='snappy', index=False)
+    os.replace(tmp_path, path)
     return df
 
 
-@pytest.fixture
-def mock_data_engine(temp_dir):
-    """Create a DataEngine with temporary storage."""
+@pytest.fixture(scope="session")
+def sample_ohlcv_indexed(sample_ohlcv_data):
+    """Sample OHLCV data indexed by timestamp (shared, read-only)."""
+    return sample_ohlcv_data.set_index('timestamp')
+
+
+@pytest.fixture(scope="session")
+def recipe_price_df(sample_ohlcv_indexed):
+    """OHLCV-only price frame, as returned by DataEngine.load_prices."""
+    return sample_ohlcv_indexed[['open', 'high', 'low', 'close', 'volume']]
+
+
+@pytest.fixture(scope="session")
+def bt_feed(sample_ohlcv_indexed):
+    """
+    Backtrader feed over the sample data, shared across the session.
+    
+    Cerebro restarts a feed on each run, so one instance can be added to
+    any number of fresh Cerebros (one at a time). PandasDirectData reads
+    columns by position (open, high, low, close, volume after the
+    timestamp index), skipping PandasData's per-bar column lookups.
+    """
+    import backtrader as bt
+    
+    return bt.feeds.PandasDirectData(
+        dataname=sample_ohlcv_indexed,  # type: ignore[arg-type]
+        openinterest=-1,  # sample data has no open interest column
+    )
+
+
+@pytest.fixture(scope="session")
+def _session_data_engine():
+    """DataEngine on an in-memory DuckDB, created once per test session."""
+    # DataEngine's default indicators need pandas-ta (requirements.txt)
+    pytest.importorskip("pandas_ta")
     from engines.data_engine import DataEngine
     
-    db_path = str(Path(temp_dir) / "test_trader.duckdb")
-    engine = DataEngine(db_path=db_path, use_cache=True)
+    engine = DataEngine(db_path=":memory:", use_cache=True)
     
     yield engine
     
     # Cleanup
     if hasattr(engine, 'close'):
         engine.close()
+
+
+@pytest.fixture
+def mock_data_engine(_session_data_engine):
+    """DataEngine with an empty catalog (shared session engine, truncated per test)."""
+    _session_data_engine.store.conn.execute("DELETE FROM data_files")
+    return _session_data_engine
@@ -0,0 +1,103 @@
+"""Tests for the Streamlit bridge (cached recipe runner)."""
+
+import pickle
+
+import pytest
+from loguru import logger
+
+import main
+from streamlit_components import bridge
+from streamlit_components.bridge import StreamlitBridge, _run_recipe_cached
+
+
+@pytest.fixture
+def fake_data_engine(monkeypatch, recipe_price_df):
+    """Make main.py's recipe runner load the sample frame instead of real data."""
+
+    class FakeDataEngine:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def load_prices(self, *args, **kwargs):
+            return recipe_price_df
+
+    monkeypatch.setattr(main, "DataEngine", FakeDataEngine)
+    _run_recipe_cached.clear()
+    yield
+    _run_recipe_cached.clear()
+
+
+def test_run_recipe_cached_returns_picklable_results(fake_data_engine, tmp_path):
+    """st.cache_data pickles return values, so no live backtrader objects may leak out."""
+    # A file sink (as in the app) makes loggers bound on strategies unpicklable
+    sink_id = logger.add(tmp_path / "test.log")
+
+    try:
+        result = _run_recipe_cached(
+            "sample", "AAPL", "2023-01-01", "2023-04-10", 100000.0, 0.001,
+            (("fast_period", 5), ("slow_period", 20)), 0.0,
+        )
+    finally:
+        logger.remove(sink_id)
+
+    assert "strategy" not in result
+    restored = pickle.loads(pickle.dumps(result))
+    assert restored["final_value"] == result["final_value"]
+    assert restored["data"].equals(result["data"])
+
+
+def test_run_recipe_cache_hit_logs_results_and_tracks_data(monkeypatch, fake_data_engine, tmp_path):
+    """A cache hit still logs a result block; new processed data misses the cache."""
+    monkeypatch.setattr(bridge, "PROCESSED_DIR", tmp_path)
+    runs = []
+    run_recipe_programmatic = main.run_recipe_programmatic
+    monkeypatch.setattr(
+        main, "run_recipe_programmatic",
+        lambda **kwargs: runs.append(kwargs) or run_recipe_programmatic(**kwargs),
+    )
+    lines = []
+    sink_id = logger.add(lines.append, format="{message}")
+    sb = StreamlitBridge.__new__(StreamlitBridge)
+
+    def run():
+        return sb.run_recipe("sample", "AAPL", "2023-01-01", "2023-04-10", fast_period=5, slow_period=20)
+
+    def blocks():
+        return [line.strip() for line in lines if line.startswith("Strategy: ")]
+
+    try:
+        first = run()
+        fresh_blocks = blocks()
+        second = run()
+        hit_blocks = blocks()[len(fresh_blocks):]
+
+        # Re-downloaded prices bump the processed file's mtime
+        (tmp_path / "AAPL.parquet").write_bytes(b"")
+        run()
+    finally:
+        logger.remove(sink_id)
+
+    assert second["final_value"] == first["final_value"]
+    assert fresh_blocks
+    assert hit_blocks == fresh_blocks[-1:]
+    assert len(runs) == 2
+
+
+def test_get_symbol_infos_mixed_symbols(monkeypatch, tmp_path, sample_ohlcv_data):
+    """Present symbols get their info, missing ones map to None, order is kept."""
+    sample_ohlcv_data.to_parquet(tmp_path / "AAPL.parquet", index=False)
+    monkeypatch.setattr(bridge, "PROCESSED_DIR", tmp_path)
+
+    # Only the parquet lookups are under test; skip building the engines
+    infos = StreamlitBridge.__new__(StreamlitBridge).get_symbol_infos(["MISSING", "AAPL"])
+
+    assert list(infos) == ["MISSING", "AAPL"]
+    assert infos["MISSING"] is None
+    assert infos["AAPL"]["rows"] == len(sample_ohlcv_data)
+    assert infos["AAPL"]["start_date"] == "2023-01-01"
+    assert infos["AAPL"]["columns"] == ["open", "high", "low", "close", "volume"]
+
+
+def test_get_symbol_infos_empty():
+    """No symbols means no thread pool and an empty mapping."""
+    assert StreamlitBridge.__new__(StreamlitBridge).get_symbol_infos([]) == {}
@@ -0,0 +1,32 @@
+"""Tests for the Streamlit chart helpers."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from streamlit_components.charts import _drawdown_kernel, _drawdown_numpy, plot_drawdown
+
+
+@pytest.mark.parametrize("values", [
+    [100.0, 110.0, 99.0, 120.0, 60.0],
+    [0.0, 1.0, 2.0],
+    [100.0, np.nan, 90.0, 120.0],
+    [np.nan, 100.0, 80.0],
+    [],
+])
+def test_drawdown_kernel_matches_numpy(values):
+    """The JIT kernel and the NumPy fallback give the same drawdown."""
+    vals = np.array(values, dtype=np.float64)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected = _drawdown_numpy(vals)
+        actual = _drawdown_kernel(vals)
+
+    np.testing.assert_array_equal(actual, expected)
+
+
+def test_plot_drawdown_zero_start():
+    """A zero starting equity must not raise ZeroDivisionError."""
+    fig = plot_drawdown(pd.Series([0.0, 1.0, 2.0]))
+
+    np.testing.assert_array_equal(fig.data[0].y[1:], [0.0, 0.0])
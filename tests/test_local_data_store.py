@@ -2,6 +2,11 @@
 Tests for LocalDataStore V2.
 """
 
+import os
+import shutil
+import subprocess
+import sys
+
 import pytest
 import pandas as pd
 from pathlib import Path
@@ -10,25 +15,24 @@ from datetime import datetime
 from engines.local_data_store_v2 import LocalDataStoreV2
 
 
-class TestLocalDataStoreV2:
-    """Test cases for LocalDataStoreV2."""
+class TestLocalDataStoreV2Init:
+    """Construction and path layout; no catalog or parquet data involved."""
     
-    def test_init(self, temp_dir):
+    @staticmethod
+    def _store(store_paths):
+        """Fresh store on an in-memory catalog (no DuckDB file)."""
+        return LocalDataStoreV2(duckdb_path=':memory:', base_dir=store_paths.parquet)
+    
+    def test_init(self, store_paths):
         """Test initialization."""
-        store = LocalDataStoreV2(
-            duckdb_path=str(Path(temp_dir) / "test.duckdb"),
-            base_dir=str(Path(temp_dir) / "parquet")
-        )
+        store = self._store(store_paths)
         
         assert store.conn is not None
-        assert Path(temp_dir, "parquet").exists()
+        assert Path(store_paths.parquet).exists()
     
-    def test_get_file_path_high_frequency(self, temp_dir):
+    def test_get_file_path_high_frequency(self, store_paths):
         """Test file path generation for high frequency data."""
-        store = LocalDataStoreV2(
-            duckdb_path=str(Path(temp_dir) / "test.duckdb"),
-            base_dir=str(Path(temp_dir) / "parquet")
-        )
+        store = self._store(store_paths)
         
         # High frequency (1m) should include year
         path = store._get_file_path('binance/spot', 'BTCUSDT', '1m', 2023)
@@ -37,28 +41,31 @@ class TestLocalDataStoreV2:
         assert 'BTCUSDT' in str(path)
         assert '2023.parquet' in str(path)
     
-    def test_get_file_path_low_frequency(self, temp_dir):
+    def test_get_file_path_low_frequency(self, store_paths):
         """Test file path generation for low frequency data."""
-        store = LocalDataStoreV2(
-            duckdb_path=str(Path(temp_dir) / "test.duckdb"),
-            base_dir=str(Path(temp_dir) / "parquet")
-        )
+        store = self._store(store_paths)
         
         # Low frequency (1d) should NOT include year
         path = store._get_file_path('stocks/us', 'AAPL', '1d')
         
         assert '1d' in str(path)
         assert 'AAPL.parquet' in str(path)
+
+
+class TestLocalDataStoreV2:
+    """Test cases for LocalDataStoreV2."""
+    
+    @pytest.fixture(autouse=True)
+    def _clean(self, local_store):
+        """Empty the shared store's catalog and parquet files before each test."""
+        local_store.conn.execute("DELETE FROM data_files")
+        shutil.rmtree(local_store.base_dir, ignore_errors=True)
+        local_store.base_dir.mkdir(parents=True)
     
-    def test_save_and_get_data(self, temp_dir, sample_ohlcv_data):
+    def test_save_and_get_data(self, local_store, sample_ohlcv_data):
         """Test saving and retrieving data."""
-        store = LocalDataStoreV2(
-            duckdb_path=str(Path(temp_dir) / "test.duckdb"),
-            base_dir=str(Path(temp_dir) / "parquet")
-        )
-        
         # Save data
-        store.save_data(
+        local_store.save_data(
             sample_ohlcv_data.copy(),
             source='stocks/us',
             symbol='TEST',
@@ -66,7 +73,7 @@ class TestLocalDataStoreV2:
         )
         
         # Retrieve data
-        df = store.get_data(
+        df = local_store.get_data(
             source='stocks/us',
             symbol='TEST',
             timeframe='1d',
@@ -78,20 +85,15 @@ class TestLocalDataStoreV2:
         assert len(df) == 100
         assert 'close' in df.columns
     
-    def test_has_data(self, temp_dir, sample_ohlcv_data):
+    def test_has_data(self, local_store, sample_ohlcv_data):
         """Test data existence check."""
-        store = LocalDataStoreV2(
-            duckdb_path=str(Path(temp_dir) / "test.duckdb"),
-            base_dir=str(Path(temp_dir) / "parquet")
-        )
-        
         # Should not have data initially
-        assert not store.has_data(
+        assert not local_store.has_data(
             'stocks/us', 'TEST', '1d', '2023-01-01', '2023-12-31'
         )
         
         # Save data
-        store.save_data(
+        local_store.save_data(
             sample_ohlcv_data.copy(),
             source='stocks/us',
             symbol='TEST',
@@ -99,26 +101,41 @@ class TestLocalDataStoreV2:
         )
         
         # Should have data now
-        assert store.has_data(
+        assert local_store.has_data(
             'stocks/us', 'TEST', '1d', '2023-01-01', '2023-12-31'
         )
     
-    def test_merge_duplicate_data(self, temp_dir, sample_ohlcv_data):
-        """Test that duplicate data is merged correctly."""
-        store = LocalDataStoreV2(
-            duckdb_path=str(Path(temp_dir) / "test.duckdb"),
-            base_dir=str(Path(temp_dir) / "parquet")
+    def test_dedup_within_single_save(self, local_store, sample_ohlcv_data):
+        """Test that duplicate bars within one save are collapsed."""
+        dup = pd.concat([sample_ohlcv_data, sample_ohlcv_data], ignore_index=True)
+        local_store.save_data(
+            dup,
+            source='stocks/us',
+            symbol='TEST',
+            timeframe='1d'
         )
         
+        df = local_store.get_data(
+            source='stocks/us',
+            symbol='TEST',
+            timeframe='1d',
+            start='2023-01-01',
+            end='2023-12-31'
+        )
+        
+        assert len(df) == 100
+    
+    def test_merge_duplicate_data(self, local_store, sample_ohlcv_data):
+        """Test that duplicate data is merged correctly across saves."""
         # Save data twice
-        store.save_data(
+        local_store.save_data(
             sample_ohlcv_data.copy(),
             source='stocks/us',
             symbol='TEST',
             timeframe='1d'
         )
         
-        store.save_data(
+        local_store.save_data(
             sample_ohlcv_data.copy(),
             source='stocks/us',
             symbol='TEST',
@@ -126,7 +143,7 @@ class TestLocalDataStoreV2:
         )
         
         # Should still have 100 bars (no duplicates)
-        df = store.get_data(
+        df = local_store.get_data(
             source='stocks/us',
             symbol='TEST',
             timeframe='1d',
@@ -136,15 +153,10 @@ class TestLocalDataStoreV2:
         
         assert len(df) == 100
     
-    def test_catalog_update(self, temp_dir, sample_ohlcv_data):
+    def test_catalog_update(self, local_store, sample_ohlcv_data):
         """Test that catalog is updated correctly."""
-        store = LocalDataStoreV2(
-            duckdb_path=str(Path(temp_dir) / "test.duckdb"),
-            base_dir=str(Path(temp_dir) / "parquet")
-        )
-        
         # Save data
-        store.save_data(
+        local_store.save_data(
             sample_ohlcv_data.copy(),
             source='stocks/us',
             symbol='TEST',
@@ -152,10 +164,49 @@ class TestLocalDataStoreV2:
         )
         
         # Check catalog
-        result = store.conn.execute(
-            "SELECT * FROM data_files WHERE symbol = 'TEST'"
+        rows = local_store.conn.execute(
+            "SELECT symbol, row_count FROM data_files WHERE symbol = ?", ['TEST']
         ).fetchall()
         
-        assert len(result) == 1
-        assert result[0][1] == 'TEST'  # symbol (index 1)
-        assert result[0][6] == 100      # row_count (index 6)
+        assert len(rows) == 1
+        symbol, row_count = rows[0]
+        assert symbol == 'TEST'
+        assert row_count == 100
+
+
+class TestLocalDataStoreV2TimeZone:
+    """Date filtering must not depend on the machine's local time zone."""
+    
+    # DuckDB picks up the local zone once per process, so the check runs
+    # in a subprocess started with a non-UTC TZ
+    SCRIPT = """
+import sys
+import pandas as pd
+from engines.local_data_store_v2 import LocalDataStoreV2
+
+store = LocalDataStoreV2(duckdb_path=':memory:', base_dir=sys.argv[1])
+hourly = pd.DataFrame({
+    'timestamp': pd.date_range('2023-01-01', periods=72, freq='h'),  # naive UTC
+    'open': 1.0, 'high': 1.0, 'low': 1.0, 'close': 1.0, 'volume': 1,
+})
+store.save_data(hourly, source='crypto', symbol='TEST', timeframe='1h')
+df = store.get_data('crypto', 'TEST', '1h', '2023-01-02', '2023-01-03')
+print(len(df), df.index[0].isoformat(), df.index[-1].isoformat())
+"""
+    
+    @pytest.mark.parametrize('tz', ['America/New_York', 'Asia/Tokyo'])
+    def test_get_data_naive_intraday_window(self, store_paths, tz):
+        """Naive (UTC) hourly bars are windowed on UTC day boundaries."""
+        root = Path(__file__).parent.parent
+        result = subprocess.run(
+            [sys.executable, '-c', self.SCRIPT, store_paths.parquet],
+            cwd=root,
+            env={**os.environ, 'TZ': tz, 'PYTHONPATH': str(root)},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        
+        assert result.stdout.split()[-3:] == [
+            '24', '2023-01-02T00:00:00+00:00', '2023-01-02T23:00:00+00:00'
+        ]
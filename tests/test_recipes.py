@@ -2,41 +2,45 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Type
+from importlib import import_module
+from typing import Any, Dict
 
 import pandas as pd
 import pytest
 
 import main
-from strategies.bollinger_rsi_strategy import BollingerRSIStrategy
-from strategies.macd_ema_strategy import MACDEMAStrategy
-from strategies.multi_timeframe_strategy import MultiTimeframeMomentumStrategy
-from strategies.rsi_strategy import RSIStrategy
-from strategies.sample_sma_strategy import SampleSMAStrategy
+
+
+def _strategy_cls(module: str, cls_name: str):
+    """Import a strategy class only when its parameter case runs."""
+    return getattr(import_module(module), cls_name)
 
 
 @pytest.mark.parametrize(
-    "recipe_name,expected_cls",
+    "recipe_name,strategy_module,strategy_name",
     [
-        ("sample", SampleSMAStrategy),
-        ("rsi", RSIStrategy),
-        ("macd_ema", MACDEMAStrategy),
-        ("bollinger_rsi", BollingerRSIStrategy),
-        ("multi_timeframe", MultiTimeframeMomentumStrategy),
+        ("sample", "strategies.sample_sma_strategy", "SampleSMAStrategy"),
+        ("rsi", "strategies.rsi_strategy", "RSIStrategy"),
+        ("macd_ema", "strategies.macd_ema_strategy", "MACDEMAStrategy"),
+        ("bollinger_rsi", "strategies.bollinger_rsi_strategy", "BollingerRSIStrategy"),
+        ("multi_timeframe", "strategies.multi_timeframe_strategy", "MultiTimeframeMomentumStrategy"),
     ],
+    ids=["sample", "rsi", "macd_ema", "bollinger_rsi", "multi_timeframe"],
 )
-def test_recipes_expose_strategy_cls(recipe_name: str, expected_cls: Type):
+def test_recipes_expose_strategy_cls(recipe_name: str, strategy_module: str, strategy_name: str):
     """All recipes should declare the strategy they orchestrate."""
+    expected_cls = _strategy_cls(strategy_module, strategy_name)
     recipe_cls = main.RECIPE_REGISTRY[recipe_name]
     assert getattr(recipe_cls, "strategy_cls", None) is expected_cls
 
 
 @pytest.mark.parametrize(
-    "recipe_name,strategy_cls,extra_params",
+    "recipe_name,strategy_module,strategy_name,extra_params",
     [
         (
             "bollinger_rsi",
-            BollingerRSIStrategy,
+            "strategies.bollinger_rsi_strategy",
+            "BollingerRSIStrategy",
             {
                 "bb_period": 25,
                 "bb_dev": 2.5,
@@ -44,7 +48,8 @@ def test_recipes_expose_strategy_cls(recipe_name: str, expected_cls: Type):
         ),
         (
             "multi_timeframe",
-            MultiTimeframeMomentumStrategy,
+            "strategies.multi_timeframe_strategy",
+            "MultiTimeframeMomentumStrategy",
             {
                 "rsi_period": 10,
                 "rsi_entry_min": 55,
@@ -65,22 +70,20 @@ def test_recipes_expose_strategy_cls(recipe_name: str, expected_cls: Type):
             },
         ),
     ],
+    ids=["bollinger_rsi", "multi_timeframe"],
 )
-def test_run_recipe_programmatic_uses_recipe_strategy(monkeypatch, sample_ohlcv_data, recipe_name, strategy_cls, extra_params):
+def test_run_recipe_programmatic_uses_recipe_strategy(
+    monkeypatch, recipe_price_df, recipe_name, strategy_module, strategy_name, extra_params
+):
     """Programmatic recipe execution should use the recipe's declared strategy class."""
-    price_df = (
-        sample_ohlcv_data
-        .copy()
-        .set_index("timestamp")
-        [["open", "high", "low", "close", "volume"]]
-    )
+    strategy_cls = _strategy_cls(strategy_module, strategy_name)
 
     class FakeDataEngine:
         def __init__(self, *args, **kwargs):
             pass
 
         def load_prices(self, *args, **kwargs):
-            return price_df
+            return recipe_price_df
 
     captured: Dict[str, Any] = {}
 
@@ -0,0 +1,218 @@
+"""
+Tests for the backtest results log parser used by the Analysis page.
+"""
+
+import pytest
+import streamlit as st
+
+from streamlit_components import results_log
+from streamlit_components.results_log import (
+    RESULTS_MARKER,
+    load_all_backtest_results,
+    parse_result_blocks,
+    read_results_parquet,
+    split_parsed_text,
+)
+
+PREFIX = "2026-10-15 22:37:18 | INFO     | engines.backtest_engine:log_results:300 - "
+
+
+def result_block(symbol, strategy="RSIStrategy", final_value="100,013.14", trades=2):
+    """Log text of one BacktestEngine results block."""
+    lines = [
+        "=" * 60,
+        RESULTS_MARKER,
+        "=" * 60,
+        f"Symbol: {symbol}",
+        f"Strategy: {strategy}",
+        "Initial Capital: $100,000.00",
+        f"Final Value: ${final_value}",
+        "Total P&L: $13.14",
+        "Total Return: 0.01%",
+        "-" * 60,
+        "RISK METRICS",
+        "-" * 60,
+        "Sharpe Ratio: 0.5000",
+        "Max Drawdown: 1.25%",
+        "-" * 60,
+        "TRADE STATISTICS",
+        "-" * 60,
+        f"Total Trades: {trades}",
+        "Won Trades: 1",
+        "Lost Trades: 1",
+        "Win Rate: 50.00%",
+        "Average Trade: $6.57",
+        "=" * 60,
+    ]
+    return "".join(f"{PREFIX}{line}\n" for line in lines)
+
+
+NOISE = f"{PREFIX}Loaded 100 rows for AAA\n"
+
+
+class TestParseResultBlocks:
+    """Test cases for parse_result_blocks."""
+    
+    def test_parses_fields(self):
+        """Every metric line becomes a typed field."""
+        results = parse_result_blocks(NOISE + result_block("AAA") + NOISE)
+        
+        assert results == [{
+            'timestamp': "2026-10-15 22:37:18",
+            'symbol': "AAA",
+            'strategy': "RSIStrategy",
+            'initial_value': 100000.0,
+            'final_value': 100013.14,
+            'pnl': 13.14,
+            'return': 0.01,
+            'sharpe': 0.5,
+            'max_drawdown': 1.25,
+            'total_trades': 2,
+            'won_trades': 1,
+            'lost_trades': 1,
+            'win_rate': 50.0,
+            'avg_trade': 6.57,
+        }]
+    
+    def test_multiple_blocks_in_order(self):
+        """Blocks come back in log order."""
+        text = result_block("AAA") + NOISE + result_block("BBB", "SampleSMAStrategy")
+        
+        results = parse_result_blocks(text)
+        
+        assert [(r['symbol'], r['strategy']) for r in results] == [
+            ("AAA", "RSIStrategy"), ("BBB", "SampleSMAStrategy"),
+        ]
+    
+    def test_skips_incomplete_blocks(self):
+        """Blocks without a final value are dropped."""
+        text = result_block("AAA").replace("Final Value", "Closing Value")
+        
+        assert parse_result_blocks(text) == []
+    
+    def test_no_blocks(self):
+        """Text without markers yields no results."""
+        assert parse_result_blocks(NOISE * 3) == []
+
+
+class TestSplitParsedText:
+    """Test cases for split_parsed_text."""
+    
+    def test_complete_block_keeps_short_tail(self):
+        """Text after the closing separator is trimmed to a marker prefix."""
+        block = result_block("AAA")
+        
+        complete, pending = split_parsed_text(block + NOISE * 5)
+        
+        assert block.startswith(complete)
+        assert parse_result_blocks(complete) == parse_result_blocks(block)
+        assert len(pending) == len(RESULTS_MARKER) - 1
+        assert (block + NOISE * 5).endswith(pending)
+    
+    def test_unfinished_block_is_carried(self):
+        """A block without its closing separator waits for the next read."""
+        first = result_block("AAA")
+        second = result_block("BBB")
+        cut = second.index("Won Trades")
+        
+        complete, pending = split_parsed_text(first + second[:cut])
+        
+        assert parse_result_blocks(complete) == parse_result_blocks(first)
+        assert pending.startswith(RESULTS_MARKER)
+
+
+@pytest.fixture
+def results_log_paths(monkeypatch, tmp_path):
+    """Point the loader at a temp log/snapshot and give it fresh session state."""
+    log_path = tmp_path / "wawastock.log"
+    monkeypatch.setattr(results_log, "LOG_PATH", log_path)
+    monkeypatch.setattr(results_log, "RESULTS_PARQUET_PATH", tmp_path / "results.parquet")
+    st.session_state.pop('_log_parse_state', None)
+    
+    yield log_path
+    
+    st.session_state.pop('_log_parse_state', None)
+
+
+class TestLoadAllBacktestResults:
+    """Test cases for the incremental loader."""
+    
+    def test_missing_log(self, results_log_paths):
+        """No log means no results."""
+        assert load_all_backtest_results() == []
+    
+    @pytest.mark.parametrize("cut_in", ["marker", "block"])
+    def test_block_split_across_reads(self, results_log_paths, cut_in):
+        """A block cut mid-marker or mid-metrics is parsed once the rest arrives."""
+        second = result_block("BBB")
+        marker_at = second.index(RESULTS_MARKER)
+        cut = marker_at + 10 if cut_in == "marker" else second.index("Won Trades")
+        text = result_block("AAA") + NOISE + second
+        cut += len(text) - len(second)
+        
+        results_log_paths.write_text(text[:cut])
+        assert [r['symbol'] for r in load_all_backtest_results()] == ["AAA"]
+        
+        with open(results_log_paths, "a") as f:
+            f.write(text[cut:])
+        
+        assert [r['symbol'] for r in load_all_backtest_results()] == ["AAA", "BBB"]
+    
+    def test_snapshot_keeps_partial_marker(self, results_log_paths):
+        """A new session starting from the snapshot still completes a cut marker."""
+        second = result_block("BBB")
+        cut = second.index(RESULTS_MARKER) + 10
+        results_log_paths.write_text(result_block("AAA") + second[:cut])
+        load_all_backtest_results()
+        
+        results, meta = read_results_parquet(results_log.RESULTS_PARQUET_PATH)
+        pending = meta['pending']
+        assert [r['symbol'] for r in results] == ["AAA"]
+        assert RESULTS_MARKER.startswith(pending[pending.index(RESULTS_MARKER[:10]):])
+        
+        # New session: picks up the snapshot instead of reparsing the log
+        st.session_state.pop('_log_parse_state')
+        assert [r['symbol'] for r in load_all_backtest_results()] == ["AAA"]
+        
+        with open(results_log_paths, "a") as f:
+            f.write(second[cut:])
+        
+        assert [r['symbol'] for r in load_all_backtest_results()] == ["AAA", "BBB"]
+    
+    def test_truncated_log_starts_over(self, results_log_paths):
+        """A rotated/truncated log is parsed again from the start."""
+        results_log_paths.write_text(result_block("AAA") + result_block("BBB"))
+        assert len(load_all_backtest_results()) == 2
+        
+        results_log_paths.write_text(result_block("CCC"))
+        
+        assert [r['symbol'] for r in load_all_backtest_results()] == ["CCC"]
+    
+    def test_snapshot_written_only_with_new_results(self, results_log_paths):
+        """Log growth without new result blocks leaves the snapshot alone."""
+        snapshot = results_log.RESULTS_PARQUET_PATH
+        results_log_paths.write_text(result_block("AAA"))
+        load_all_backtest_results()
+        written = snapshot.stat().st_mtime_ns
+        
+        with open(results_log_paths, "a") as f:
+            f.write(NOISE * 3)
+        load_all_backtest_results()
+        
+        assert snapshot.stat().st_mtime_ns == written
+        assert list(snapshot.parent.glob("*.tmp")) == []
+    
+    def test_new_session_resumes_from_snapshot(self, results_log_paths):
+        """A stale snapshot is resumed from its offset, not reparsed from the start."""
+        results_log_paths.write_text(result_block("AAA"))
+        load_all_backtest_results()
+        with open(results_log_paths, "a") as f:
+            f.write(NOISE + result_block("BBB"))
+        
+        # Tamper with the already-parsed text: a full reparse would see "ZZZ"
+        text = results_log_paths.read_text()
+        results_log_paths.write_text(text.replace("Symbol: AAA", "Symbol: ZZZ"))
+        st.session_state.pop('_log_parse_state')
+        
+        assert [r['symbol'] for r in load_all_backtest_results()] == ["AAA", "BBB"]
+
@@ -0,0 +1,32 @@
+"""Optional Numba JIT shim.
+
+Exposes ``njit`` which compiles with Numba when it is installed and
+otherwise returns the decorated function unchanged, so callers can
+decorate kernels unconditionally.
+"""
+
+try:
+    from numba import njit as _numba_njit
+except ImportError:
+    _numba_njit = None
+
+NUMBA_AVAILABLE = _numba_njit is not None
+
+
+def njit(*args, **kwargs):
+    """
+    Drop-in replacement for ``numba.njit``.
+
+    Supports both ``@njit`` and ``@njit(cache=True)`` forms.
+    """
+    if _numba_njit is not None:
+        return _numba_njit(*args, **kwargs)
+
+    # Bare decorator: @njit
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+
+    # Decorator factory: @njit(...)
+    def decorator(func):
+        return func
+    return decorator
@@ -1,5 +1,6 @@
 """Centralized logging configuration using Loguru with Rich formatting."""
 import sys
+import threading
 from pathlib import Path
 from loguru import logger
 from rich.console import Console
@@ -7,6 +8,13 @@ from rich.console import Console
 # Global console instance for rich output
 console = Console()
 
+# Uncolored record format shared by the file sink and non-TTY console
+PLAIN_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}"
+
+# Default configuration is applied lazily by the first get_logger() call
+_INITIALIZED = False
+_INIT_LOCK = threading.Lock()
+
 
 def setup_logger(
     level: str = "INFO",
@@ -27,17 +35,28 @@ def setup_logger(
         colorize: Whether to use colors in console output
         console_output: Whether to output logs to console (default: False, only to file)
     """
+    global _INITIALIZED
+    
     # Remove default handler
     logger.remove()
     
     # Add console handler only if explicitly enabled
     if console_output:
-        logger.add(
-            sys.stderr,
-            format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-            level=level,
-            colorize=colorize,
-        )
+        # Markup formats are only worth parsing when colors reach a terminal
+        if colorize and sys.stderr.isatty():
+            logger.add(
+                sys.stderr,
+                format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
+                level=level,
+                colorize=True,
+            )
+        else:
+            logger.add(
+                sys.stderr,
+                format=PLAIN_FORMAT,
+                level=level,
+                colorize=False,
+            )
     
     # Add file handler with rotation
     log_path = Path(log_file)
@@ -45,14 +64,19 @@ def setup_logger(
     
     logger.add(
         log_file,
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
+        format=PLAIN_FORMAT,
         level=level,
         rotation=rotation,
         retention=retention,
-        compression="zip",
+        compression="gz",
     )
     
-    logger.info(f"Logger initialized - Level: {level}, File: {log_file}")
+    if level == "DEBUG":
+        logger.debug(f"Logger initialized - Level: {level}, File: {log_file}")
+    
+    # Only now: get_logger() skips the lock once this is set, so other
+    # threads must not see it before the sinks exist
+    _INITIALIZED = True
 
 
 def get_logger(name: str | None = None):
@@ -65,10 +89,12 @@ def get_logger(name: str | None = None):
     Returns:
         Logger instance
     """
+    if not _INITIALIZED:
+        with _INIT_LOCK:
+            if not _INITIALIZED:
+                setup_logger()
+    
     if name:
         return logger.bind(name=name)
     return logger
 
-
-# Initialize with default settings on import
-setup_logger()